@@ -0,0 +1,63 @@
+"""Per-test-case memory footprint: loose dicts vs slotted TestCase models.
+
+Run from ``src/``: ``python -m benchmarks.model_memory_bench``.
+"""
+import argparse
+import gc
+import tracemalloc
+from datetime import datetime
+from typing import Callable, List, Any
+from models.test_case import TestCase
+
+PRIORITIES = ["High", "Medium", "Low"]
+
+def _fresh(text: str) -> str:
+    # Parsed LLM output yields a new string object per case, never a shared literal
+    return "".join(list(text))
+
+def make_dict(i: int) -> dict:
+    return {
+        "id": f"TC-{i:03d}",
+        "title": f"Verify behaviour {i}",
+        "priority": _fresh(PRIORITIES[i % 3]),
+        "description": f"Scenario {i}",
+        "steps": [f"step {i}.1", f"step {i}.2"],
+        "expected_result": f"Result {i}",
+        "generated_at": datetime.now().isoformat(),
+        "approved": False,
+        "approved_by": None
+    }
+
+def make_model(i: int) -> TestCase:
+    return TestCase(
+        id=f"TC-{i:03d}",
+        title=f"Verify behaviour {i}",
+        priority=_fresh(PRIORITIES[i % 3]),
+        description=f"Scenario {i}",
+        steps=[f"step {i}.1", f"step {i}.2"],
+        expected_result=f"Result {i}"
+    )
+
+def measure(factory: Callable[[int], Any], count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items: List[Any] = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return (after - before) / count
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare test case memory footprints')
+    parser.add_argument('--count', type=int, default=50000)
+    args = parser.parse_args()
+
+    as_dict = measure(make_dict, args.count)
+    as_model = measure(make_model, args.count)
+    print(f"dict test case:    {as_dict:.0f} bytes")
+    print(f"TestCase (slots):  {as_model:.0f} bytes")
+    print(f"saved per case:    {as_dict - as_model:.0f} bytes ({(1 - as_model / as_dict) * 100:.0f}%)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Risk scoring throughput and false-positive check.
+
+Run from ``src/``: ``python -m benchmarks.risk_scoring_bench``. Exits non-zero
+when scoring a synthetic patch exceeds the per-MB budget, or when a known
+harmless change is rated Medium or higher.
+"""
+import argparse
+import random
+import sys
+import time
+from utils.risk_analyzer import RiskAnalyzer
+from utils.risk_scoring import score_file
+
+BUDGET_MS_PER_MB = 500.0
+
+_LINES = [
+    "+    token = request.headers.get('Authorization')",
+    "-    result = compute(value, retries=3)",
+    "+    result = compute(value, retries=5, timeout=timeout)",
+    "     unchanged context line",
+    "+    try:",
+    "+        handle(event)",
+    "+    except ValueError as e:",
+    "+        raise ConfigError(str(e))",
+    "-def load_user(user_id, strict=False):",
+    "+def load_user(user_id: int, strict: bool = True) -> User:",
+    "+# remove legacy fallback once clients migrate",
+]
+
+_TOKENIZER_REFACTOR = (
+    "@@ -10,3 +10,3 @@\n"
+    "-    words = text.split()\n"
+    "+    tokens = tokenizer.tokenize(text)\n"
+    "+    for token in tokens:\n"
+    "+        emit(token)"
+)
+
+# Harmless changes that must stay Low: (description, diffs)
+_HARMLESS = [
+    ("tokenizer refactor", {"src/lexer.py": _TOKENIZER_REFACTOR}),
+    ("tokenizer refactor in two files", {"src/lexer.py": _TOKENIZER_REFACTOR, "src/parser.py": _TOKENIZER_REFACTOR}),
+    ("comment about speed", {"src/lexer.py": "@@ -1 +1 @@\n+# speed up the tokenizer: avoid slow path"}),
+]
+
+def check_false_positives() -> bool:
+    analyzer = RiskAnalyzer()
+    ok = True
+    for description, diffs in _HARMLESS:
+        analysis = analyzer.analyze({"modified": list(diffs)}, diffs)
+        if analysis.level != "Low":
+            print(f"false positive: {description} rated {analysis.level} ({analysis.score}, {analysis.factors})")
+            ok = False
+    return ok
+
+def make_patch(size_bytes: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    lines, size, hunk = [], 0, 1
+    while size < size_bytes:
+        if len(lines) % 40 == 0:
+            lines.append(f"@@ -{hunk},40 +{hunk},42 @@")
+            hunk += 40
+        line = rng.choice(_LINES).replace("load_user", f"load_user_{len(lines) % 500}")
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark risk scoring against a per-MB budget')
+    parser.add_argument('--size-mb', type=float, default=1.0)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=BUDGET_MS_PER_MB, help='Budget in ms per MB of patch')
+    args = parser.parse_args()
+
+    accurate = check_false_positives()
+    patch = make_patch(int(args.size_mb * 1024 * 1024))
+    mb = len(patch) / (1024 * 1024)
+
+    best = float('inf')
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        score_file('src/service/handlers.py', patch)
+        best = min(best, time.perf_counter() - start)
+
+    ms_per_mb = best * 1000 / mb
+    print(f"risk scoring: {ms_per_mb:.1f} ms/MB (budget {args.budget:.0f} ms/MB, {mb:.2f} MB patch)")
+    return 0 if accurate and ms_per_mb <= args.budget else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
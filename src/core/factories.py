@@ -1,4 +1,4 @@
-from typing import Dict, Any, TypeVar, Generic
+from typing import Dict, Any, TypeVar, Generic, Iterable
 from services.base.vcs_provider import VCSProvider
 from services.base.llm_provider import LLMProvider 
 from services.base.output_provider import OutputProvider
@@ -12,6 +12,8 @@ class ProviderFactory(Generic[T]):
     
     def create(self, provider_type: str, **kwargs) -> T:
         provider_class = self.registry.get_provider(provider_type)
+        if provider_class is None:
+            raise ValueError(f"Unknown provider '{provider_type}'")
         provider_config = self.registry.get_config(provider_type)
         config = {**provider_config, **kwargs}
         return provider_class(**config)
@@ -26,10 +28,14 @@ class FactoryManager:
         self.llm_factory = ProviderFactory[LLMProvider](self.llm_registry)
         self.output_factory = ProviderFactory[OutputProvider](self.output_registry)
     
-    def configure(self, config: Dict[str, Any]) -> None:
-        """Configure providers with settings from config file"""
+    def configure(self, config: Dict[str, Any], provider_types: Iterable[str] = ('vcs', 'llm', 'output')) -> None:
+        """Configure providers with settings from config file.
+
+        Provider modules are imported lazily, so restricting ``provider_types``
+        keeps unused backends (e.g. litellm) from being imported at all.
+        """
         for provider_type, provider_config in config.get('providers', {}).items():
-            if provider_type in ['vcs', 'llm', 'output']:
+            if provider_type in provider_types:
                 registry = getattr(self, f"{provider_type}_registry")
                 for name, cfg in provider_config.items():
                     # Only register if not already registered
@@ -46,6 +52,12 @@ class FactoryManager:
                         elif provider_type == 'output' and name == 'json':
                             from services.output.json_writer import JSONWriter
                             registry.register(name, JSONWriter, cfg)
+                        elif provider_type == 'output' and name == 'markdown':
+                            from services.output.markdown_writer import MarkdownWriter
+                            registry.register(name, MarkdownWriter, cfg)
+                        elif provider_type == 'output' and name == 'junit':
+                            from services.output.junit_writer import JUnitWriter
+                            registry.register(name, JUnitWriter, cfg)
                     else:
                         # Update existing provider config
                         registry.update_config(name, cfg)
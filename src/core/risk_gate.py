@@ -0,0 +1,96 @@
+from concurrent.futures import ThreadPoolExecutor
+from services.base.vcs_provider import VCSProvider
+from models.risk_analysis import RiskAnalysis
+from utils.risk_analyzer import RiskAnalyzer
+from typing import List, Dict, Any, Optional
+import logging
+
+RISK_LEVELS = ["Low", "Medium", "High"]
+
+EXIT_PASS = 0
+EXIT_GATE_FAILED = 1
+EXIT_ERROR = 2
+
+class RiskGate:
+    """Risk classification for one or more PRs without touching the LLM.
+
+    Used as a cheap CI gate in front of test case generation: fetch each PR,
+    run the RiskAnalyzer and compare the level (and optionally the numeric
+    score) against a threshold.
+    """
+
+    def __init__(self,
+                 vcs_provider: VCSProvider,
+                 risk_analyzer: Optional[RiskAnalyzer] = None,
+                 fail_on: str = "High",
+                 max_score: Optional[float] = None,
+                 workers: int = 4):
+        if fail_on not in RISK_LEVELS:
+            raise ValueError(f"fail_on must be one of {RISK_LEVELS}, got {fail_on!r}")
+        self.vcs_provider = vcs_provider
+        self.risk_analyzer = risk_analyzer or RiskAnalyzer()
+        self.fail_on = fail_on
+        self.max_score = max_score
+        self.workers = max(1, workers)
+        self.logger = logging.getLogger(__name__)
+
+    def run(self, repo: str, pr_numbers: List[int]) -> Dict[str, Any]:
+        """Analyze every PR and return a machine-readable report."""
+        # Fetching is network bound and runs in parallel; analysis stays on this
+        # thread so the analyzer's cache is never shared across threads
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(pr_numbers) or 1)) as pool:
+            fetched = list(pool.map(lambda n: self._fetch_pr(repo, n), pr_numbers))
+
+        results = [self._analyze_pr(pr_number, pr) for pr_number, pr in zip(pr_numbers, fetched)]
+
+        return {
+            "repo": repo,
+            "fail_on": self.fail_on,
+            "max_score": self.max_score,
+            "passed": all(r["gate"] == "pass" for r in results),
+            "results": results
+        }
+
+    def exit_code(self, report: Dict[str, Any]) -> int:
+        if any(r["gate"] == "error" for r in report["results"]):
+            return EXIT_ERROR
+        return EXIT_PASS if report["passed"] else EXIT_GATE_FAILED
+
+    def _fetch_pr(self, repo: str, pr_number: int) -> Any:
+        try:
+            return self.vcs_provider.get_pull_request(repo, pr_number)
+        except Exception as e:
+            self.logger.error(f"Failed to fetch PR #{pr_number}: {str(e)}")
+            return e
+
+    def _analyze_pr(self, pr_number: int, pr: Any) -> Dict[str, Any]:
+        if isinstance(pr, Exception):
+            return {"pr_number": pr_number, "gate": "error", "error": str(pr)}
+        try:
+            changes = pr.changes if isinstance(pr.changes, dict) else {"modified": []}
+            diffs = pr.diffs if isinstance(pr.diffs, dict) else {}
+            risk_analysis = self.risk_analyzer.analyze(changes, diffs)
+            if risk_analysis.failed:
+                # The analyzer reports its own failures as a High result; for a
+                # gate that is an error, not a risk verdict
+                raise RuntimeError("; ".join(risk_analysis.details) or "risk analysis failed")
+        except Exception as e:
+            self.logger.error(f"Risk gate failed for PR #{pr_number}: {str(e)}")
+            return {"pr_number": pr_number, "gate": "error", "error": str(e)}
+
+        return {
+            "pr_number": pr.number,
+            "pr_title": pr.title,
+            "head_branch": pr.head_branch,
+            "risk_analysis": risk_analysis.to_dict(),
+            "gate": "fail" if self._exceeds(risk_analysis) else "pass"
+        }
+
+    def _exceeds(self, risk_analysis: RiskAnalysis) -> bool:
+        # Unknown levels are treated as the highest risk
+        level = risk_analysis.level
+        rank = RISK_LEVELS.index(level) if level in RISK_LEVELS else len(RISK_LEVELS)
+        if rank >= RISK_LEVELS.index(self.fail_on):
+            return True
+        score = risk_analysis.score
+        return self.max_score is not None and score is not None and score >= self.max_score
@@ -1,10 +1,12 @@
-from datetime import datetime
 from services.base.vcs_provider import VCSProvider
 from services.base.llm_provider import LLMProvider
 from services.base.output_provider import OutputProvider
 from models.test_case import TestCase
 from models.pull_request import PullRequest
+from models.risk_analysis import RiskAnalysis
 from utils.risk_analyzer import RiskAnalyzer
+from utils.repo_index import RepoIndex
+from utils.run_history import RunHistory
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
@@ -12,28 +14,26 @@ import yaml
 from typing import List, Dict, Any, Optional
 import re
 import logging
+import time
 from itertools import zip_longest
 
 class TestCaseGenerator:
     def __init__(self, 
                  vcs_provider: VCSProvider, 
                  llm_provider: LLMProvider,
-                 output_provider: OutputProvider):
+                 output_provider: OutputProvider,
+                 repo_index: Optional[RepoIndex] = None,
+                 risk_analyzer: Optional[RiskAnalyzer] = None,
+                 run_history: Optional[RunHistory] = None):
         self.vcs_provider = vcs_provider
         self.llm_provider = llm_provider
         self.output_provider = output_provider
-        self.risk_analyzer = RiskAnalyzer()
+        self.repo_index = repo_index
+        self.risk_analyzer = risk_analyzer or RiskAnalyzer()
+        self.run_history = run_history
         self.console = Console()
         self.logger = logging.getLogger(__name__)
 
-    def _safe_get_value(self, data: Dict[str, Any], key: str, default: Any) -> Any:
-        """Safely retrieve a value from a dictionary with logging."""
-        try:
-            return data.get(key, default)
-        except Exception as e:
-            self.logger.warning(f"Error getting {key}: {str(e)}")
-            return default
-
     def _ensure_dict(self, data: Any, default: Optional[Dict] = None) -> Dict:
         """Ensure input is a dictionary with logging."""
         if default is None:
@@ -43,15 +43,29 @@ class TestCaseGenerator:
             return default
         return data
 
-    def generate(self, repo: str, pr_number: int, output_file: str) -> None:
+    def generate(self, repo: str, pr_number: int, output_file: str, skip_processed: bool = False) -> None:
+        """Generate test cases for a PR.
+
+        With ``skip_processed`` and a run history, a PR whose head SHA was
+        already processed is skipped before any analysis or LLM call.
+        """
         self.console.print(f"[bold blue]🚀 Generating test cases for PR #{pr_number}[/bold blue]")
+        timings = {}
         
         with self.console.status("[bold yellow]Analyzing PR...") as status:
             try:
+                started = time.perf_counter()
                 pr = self.vcs_provider.get_pull_request(repo, pr_number)
+                timings["fetch"] = time.perf_counter() - started
                 self.logger.debug(f"PR Data: title='{pr.title}', description='{pr.description}'")
+
+                if skip_processed and self.run_history and self.run_history.has_run(repo, pr.number, pr.head_sha):
+                    self.console.print(f"[yellow]Skipping PR #{pr.number}: {pr.head_sha[:12]} already processed[/yellow]")
+                    return
                 
+                started = time.perf_counter()
                 risk_analysis = self._analyze_risk(pr)
+                timings["risk_analysis"] = time.perf_counter() - started
                 self.logger.debug(f"Risk Analysis Result: {risk_analysis}")
                 
                 self._display_risk_analysis(risk_analysis)
@@ -63,21 +77,26 @@ class TestCaseGenerator:
                 context = self._create_context(pr, risk_analysis)
                 self.logger.debug(f"Created context: {context}")
                 
+                started = time.perf_counter()
                 llm_output = self.llm_provider.generate(prompt, context)
+                timings["llm"] = time.perf_counter() - started
                 test_cases = self._parse_test_cases(llm_output)
                 
                 if not test_cases:
                     self.console.print("[red]Warning: No test cases were generated[/red]")
                 
+                started = time.perf_counter()
                 self._save_results(pr, risk_analysis, test_cases, output_file)
-                self.console.print(f"\n[green]✅ Results saved to {output_file}[/green]")
+                timings["output"] = time.perf_counter() - started
+                self._record_run(repo, pr, risk_analysis, test_cases, timings)
+                self.console.print(f"\n[green]✅ Results saved to {self._describe_outputs(output_file)}[/green]")
                 
             except Exception as e:
                 self.logger.error(f"Generation error: {str(e)}", exc_info=True)
                 self.console.print(f"[red]Error: {str(e)}[/red]")
                 raise
 
-    def _analyze_risk(self, pr: PullRequest) -> Dict[str, Any]:
+    def _analyze_risk(self, pr: PullRequest) -> RiskAnalysis:
         """Analyze PR for risks and handle None values."""
         try:
             # Convert None values to empty dicts
@@ -94,21 +113,13 @@ class TestCaseGenerator:
             return self.risk_analyzer.analyze(changes, diffs)
         except Exception as e:
             self.logger.error(f"Error in risk analysis: {str(e)}")
-            return self._create_error_analysis(str(e))
-
-    def _create_error_analysis(self, error_msg: str) -> Dict[str, Any]:
-        """Create a standardized error analysis response."""
-        return {
-            "level": "High",
-            "factors": ["Analysis Error"],
-            "details": [error_msg]
-        }
+            return RiskAnalysis.error(str(e))
 
-    def _create_context(self, pr: PullRequest, risk_analysis: dict) -> dict:
+    def _create_context(self, pr: PullRequest, risk_analysis: RiskAnalysis) -> dict:
         """Create focused context for test case generation."""
         # Format risk factors with details
-        factors = risk_analysis.get("factors", [])
-        details = risk_analysis.get("details", [])
+        factors = risk_analysis.factors
+        details = risk_analysis.details
         risk_factors = []
         for f, d in zip_longest(factors, details, fillvalue=""):
             if f and d:
@@ -119,12 +130,46 @@ class TestCaseGenerator:
         return {
             "pr_title": str(pr.title),
             "pr_description": str(pr.description),
-            "risk_level": str(risk_analysis.get("level", "High")),
+            "risk_level": str(risk_analysis.level or "High"),
             "risk_factors": "\n".join(risk_factors),
             "changes": self._format_changes(pr.changes),
-            "diffs": self._format_diffs(pr.diffs)
+            "diffs": self._format_diffs(pr.diffs),
+            "related_context": self._format_related_context(pr)
         }
 
+    def _format_related_context(self, pr: PullRequest) -> str:
+        """Pull the most relevant definitions and existing tests from the repo index."""
+        if self.repo_index is None:
+            return "No repository context available"
+        try:
+            self.repo_index.sync()
+            at_head = self.repo_index.checkout_matches(pr.head_sha)
+            if at_head is False:
+                # The index reflects the checkout, not the PR; treat the checkout
+                # as the PR base and map hunks by their old-side lines
+                self.logger.warning(
+                    f"{self.repo_index.repo_path} is not checked out at PR head {pr.head_sha[:12]}; "
+                    "using old-side hunk ranges"
+                )
+            related = self.repo_index.find_relevant(pr.diffs or {}, old_side=at_head is False)
+        except Exception as e:
+            self.logger.warning(f"Repository index lookup failed: {str(e)}")
+            return "No repository context available"
+
+        result = []
+        for definition in related["definitions"]:
+            result.append(f"{definition['kind'].capitalize()} {definition['name']} "
+                          f"({definition['path']}:{definition['line']})")
+            result.append("```python")
+            result.append(definition["source"])
+            result.append("```\n")
+        if related["tests"]:
+            result.append("Existing tests:")
+            for test in related["tests"]:
+                names = ", ".join(test["tests"][:10]) or "no test functions"
+                result.append(f"  - {test['path']}: {names}")
+        return "\n".join(result) if result else "No repository context available"
+
     def _format_changes(self, changes: Dict[str, List[str]]) -> str:
         """Format changes in a more descriptive way for the LLM."""
         result = []
@@ -154,7 +199,7 @@ class TestCaseGenerator:
         with open('prompts/templates/test_case.txt', 'r') as f:
             return f.read()
 
-    def _parse_test_cases(self, llm_output: str) -> List[Dict]:
+    def _parse_test_cases(self, llm_output: str) -> List[TestCase]:
         test_cases = []
         try:
             case_blocks = re.split(r'TC-\d+:', llm_output)
@@ -187,15 +232,12 @@ class TestCaseGenerator:
                 
                 expected_match = re.search(r'Expected Results:\s*([^\n]+(?:\n(?!\n).*)*)', block, re.DOTALL)
                 
-                test_cases.append({
-                    "id": f"TC-{i:03d}",
+                test_cases.append(TestCase(
+                    id=f"TC-{i:03d}",
                     **extracted_fields,
-                    "steps": steps,
-                    "expected_result": expected_match.group(1).strip() if expected_match else "No expected results",
-                    "generated_at": datetime.now().isoformat(),
-                    "approved": False,
-                    "approved_by": None
-                })
+                    steps=steps,
+                    expected_result=expected_match.group(1).strip() if expected_match else "No expected results"
+                ))
                 
         except Exception as e:
             self.logger.error(f"Error parsing test cases: {str(e)}")
@@ -203,7 +245,7 @@ class TestCaseGenerator:
             
         return test_cases
 
-    def _save_results(self, pr: PullRequest, risk_analysis: dict, test_cases: List[Dict], output_file: str) -> None:
+    def _save_results(self, pr: PullRequest, risk_analysis: RiskAnalysis, test_cases: List[TestCase], output_file: str) -> None:
         results = {
             "pr_number": pr.number,
             "pr_title": pr.title,
@@ -212,17 +254,44 @@ class TestCaseGenerator:
         }
         self.output_provider.write(results, output_file)
 
-    def _display_risk_analysis(self, risk_analysis: Dict[str, Any]) -> None:
+    def _record_run(self, repo: str, pr: PullRequest, risk_analysis: RiskAnalysis,
+                    test_cases: List[TestCase], timings: Dict[str, float]) -> None:
+        """Store the run in the history; failures are logged, never fatal."""
+        if self.run_history is None:
+            return
+        try:
+            self.run_history.record_run(
+                repo=repo,
+                pr_number=pr.number,
+                head_sha=pr.head_sha,
+                pr_title=pr.title,
+                risk_analysis=risk_analysis.to_dict(),
+                test_cases=[tc.to_dict() for tc in test_cases],
+                timings={phase: round(seconds, 3) for phase, seconds in timings.items()},
+                model=self.llm_provider.get_model_info().get("name"),
+                usage=self.llm_provider.get_last_usage()
+            )
+        except Exception as e:
+            self.logger.warning(f"Could not record run history: {str(e)}")
+
+    def _describe_outputs(self, output_file: str) -> str:
+        if hasattr(self.output_provider, 'output_paths'):
+            return ", ".join(self.output_provider.output_paths(output_file).values())
+        return output_file
+
+    def _display_risk_analysis(self, risk_analysis: RiskAnalysis) -> None:
         table = Table(title="Risk Analysis Results")
         
         table.add_column("Category", style="cyan")
         table.add_column("Details", style="magenta")
         
-        level = self._safe_get_value(risk_analysis, 'level', 'Unknown')
+        level = risk_analysis.level or 'Unknown'
         table.add_row("Risk Level", f"[bold]{level}[/bold]")
+        if risk_analysis.score is not None:
+            table.add_row("Risk Score", str(risk_analysis.score))
         
-        factors = self._safe_get_value(risk_analysis, 'factors', [])
-        details = self._safe_get_value(risk_analysis, 'details', [])
+        factors = risk_analysis.factors
+        details = risk_analysis.details
         
         if factors and details:
             for factor, detail in zip(factors, details):
@@ -1,10 +1,133 @@
 from core.factories import factory_manager
 from core.test_case_generator import TestCaseGenerator
 from utils.file_utils import load_config
+from utils.repo_index import RepoIndex
+from utils.risk_analyzer import RiskAnalyzer
+from utils.risk_cache import RiskCache
+from core.risk_gate import RiskGate, RISK_LEVELS, EXIT_ERROR
+from services.output.multi_writer import MultiOutputWriter
+from utils.run_history import RunHistory, DEFAULT_HISTORY_PATH, parse_since
 import logging
+import json
 import sys
 import os
 import argparse
+import yaml
+
+def create_risk_analyzer(config: dict) -> RiskAnalyzer:
+    cache_config = config.get("risk_cache", {}) or {}
+    risk_cache = RiskCache(max_entries=cache_config.get("max_entries", 4096),
+                           path=cache_config.get("path"),
+                           max_disk_entries=cache_config.get("max_disk_entries", 100000))
+    return RiskAnalyzer(risk_cache)
+
+def risk_main(argv) -> int:
+    """Risk-only mode: VCS fetch + RiskAnalyzer, no LLM provider is ever loaded."""
+    logger = logging.getLogger(__name__)
+    parser = argparse.ArgumentParser(
+        prog='main.py risk',
+        description='Classify PR risk and exit non-zero when a threshold is reached'
+    )
+    parser.add_argument('repo')
+    parser.add_argument('pr_numbers', type=int, nargs='+')
+    parser.add_argument('--config', default='config.yaml')
+    parser.add_argument('--fail-on', choices=RISK_LEVELS,
+                        help='Lowest risk level that fails the gate (default: risk_gate.fail_on or High)')
+    parser.add_argument('--max-score', type=float,
+                        help='Also fail PRs whose risk score reaches this value (default: risk_gate.max_score)')
+    parser.add_argument('--workers', type=int, help='Parallel PR fetches (default: risk_gate.workers or 4)')
+    parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+    args = parser.parse_args(argv)
+
+    try:
+        config = load_config(args.config)
+        factory_manager.configure(config, provider_types=('vcs',))
+        gate_config = config.get("risk_gate", {}) or {}
+
+        vcs = factory_manager.vcs_factory.create("github", token=config["providers"]["vcs"]["github"]["token"])
+        gate = RiskGate(vcs, create_risk_analyzer(config),
+                        fail_on=args.fail_on or gate_config.get("fail_on", "High"),
+                        max_score=args.max_score if args.max_score is not None else gate_config.get("max_score"),
+                        workers=args.workers or gate_config.get("workers", 4))
+        report = gate.run(args.repo, args.pr_numbers)
+    except Exception as e:
+        logger.error(f"Risk gate failed: {str(e)}")
+        return EXIT_ERROR
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    return gate.exit_code(report)
+
+def history_path(config: dict, override: str = None) -> str:
+    """History database path; ``history.path: null`` in the config disables recording."""
+    if override:
+        return override
+    return (config.get("history", {}) or {}).get("path", DEFAULT_HISTORY_PATH)
+
+def history_main(argv) -> int:
+    """Query recorded runs without loading any provider."""
+    logger = logging.getLogger(__name__)
+    parser = argparse.ArgumentParser(prog='main.py history', description='Query recorded qitops runs')
+    parser.add_argument('--config', default='config.yaml')
+    parser.add_argument('--db', help=f'History database (default: history.path or {DEFAULT_HISTORY_PATH})')
+    parser.add_argument('--repo')
+    parser.add_argument('--pr', type=int, dest='pr_number')
+    parser.add_argument('--sha', dest='head_sha')
+    parser.add_argument('--risk-level', choices=RISK_LEVELS)
+    parser.add_argument('--since', help='ISO date or timestamp, e.g. 2026-10-12 (UTC unless an offset is given)')
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--run', type=int, dest='run_id', help='Show the full record of one run')
+    parser.add_argument('--json', action='store_true', help='Print JSON instead of a table')
+    args = parser.parse_args(argv)
+
+    if args.since:
+        try:
+            args.since = parse_since(args.since)
+        except ValueError:
+            logger.error(f"Invalid --since value {args.since!r}; expected an ISO date or timestamp")
+            return EXIT_ERROR
+
+    try:
+        # Only the history section is resolved, so querying needs no provider credentials
+        config = {} if args.db else load_config(args.config, sections=["history"])
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        logger.error(f"Cannot read history settings from {args.config}: {str(e)}; pass --db to skip the config")
+        return EXIT_ERROR
+
+    try:
+        path = history_path(config, args.db)
+        if not path or not os.path.exists(path):
+            logger.error(f"No run history found at {path}")
+            return EXIT_ERROR
+        history = RunHistory(path)
+        if args.run_id is not None:
+            run = history.get_run(args.run_id)
+            if run is None:
+                logger.error(f"Run {args.run_id} not found")
+                return EXIT_ERROR
+            json.dump(run, sys.stdout, indent=2)
+            sys.stdout.write("\n")
+            return 0
+        runs = history.query(repo=args.repo, pr_number=args.pr_number, head_sha=args.head_sha,
+                             risk_level=args.risk_level, since=args.since, limit=args.limit)
+    except Exception as e:
+        logger.error(f"History query failed: {str(e)}")
+        return EXIT_ERROR
+
+    if args.json:
+        json.dump(runs, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        print(f"{'ID':>5}  {'CREATED':<25}  {'REPO':<30}  {'PR':>6}  {'SHA':<12}  {'RISK':<6}  {'SCORE':>6}  {'CASES':>5}")
+        for run in runs:
+            score = "" if run["risk_score"] is None else f"{run['risk_score']:.1f}"
+            print(f"{run['id']:>5}  {run['created_at']:<25}  {run['repo']:<30}  {run['pr_number']:>6}  "
+                  f"{run['head_sha'][:12]:<12}  {run['risk_level'] or '':<6}  {score:>6}  {run['test_case_count']:>5}")
+    return 0
 
 def main():
     logging.basicConfig(
@@ -13,6 +136,11 @@ def main():
     )
     logger = logging.getLogger(__name__)
 
+    if len(sys.argv) > 1 and sys.argv[1] == 'risk':
+        sys.exit(risk_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == 'history':
+        sys.exit(history_main(sys.argv[2:]))
+
     try:
         config_path = os.path.join(os.path.dirname(__file__), 'config.yaml')
         config = load_config(config_path)
@@ -26,19 +154,45 @@ def main():
         parser.add_argument('pr_number', type=int)
         parser.add_argument('--output', default='pr_test_cases.yaml')
         parser.add_argument('--config', default='config.yaml')
+        parser.add_argument('--formats',
+                            help='Comma-separated output formats: yaml, json, markdown, junit '
+                                 '(default: providers listed under providers.output)')
+        parser.add_argument('--history-db', help=f'Run history database (default: history.path or {DEFAULT_HISTORY_PATH})')
+        parser.add_argument('--skip-processed', action='store_true',
+                            help='Skip the PR if its head commit is already in the run history')
+        parser.add_argument('--repo-path',
+                            help='Local checkout, at the PR head commit, used to index related code and tests')
+        parser.add_argument('--reindex', action='store_true',
+                            help='Re-scan the whole checkout for changed files before generating')
+        parser.add_argument('--index-db', help='Index database path (default: <repo-path>/.qitops/index.db)')
         args = parser.parse_args()
 
         config = load_config(args.config)
+        output_config = config.setdefault("providers", {}).get("output") or {}
+        formats = [f.strip() for f in args.formats.split(',') if f.strip()] if args.formats else list(output_config)
+        formats = list(dict.fromkeys(formats or ["yaml"]))
+        for output_format in formats:
+            output_config.setdefault(output_format, {})
+        config["providers"]["output"] = output_config
         factory_manager.configure(config)
 
         vcs = factory_manager.vcs_factory.create("github", token=config["providers"]["vcs"]["github"]["token"])
         llm = factory_manager.llm_factory.create("litellm", 
                                                  model=config["providers"]["llm"]["litellm"]["model"], 
                                                  temperature=config["providers"]["llm"]["litellm"]["temperature"])
-        output = factory_manager.output_factory.create("yaml")
+        output = MultiOutputWriter([factory_manager.output_factory.create(f) for f in formats])
+
+        repo_index = None
+        if args.repo_path:
+            repo_index = RepoIndex(args.repo_path, args.index_db)
+            if args.reindex:
+                repo_index.build()
+
+        path = history_path(config, args.history_db)
+        run_history = RunHistory(path) if path else None
 
-        generator = TestCaseGenerator(vcs, llm, output)
-        generator.generate(args.repo, args.pr_number, args.output)
+        generator = TestCaseGenerator(vcs, llm, output, repo_index, create_risk_analyzer(config), run_history)
+        generator.generate(args.repo, args.pr_number, args.output, skip_processed=args.skip_processed)
     except Exception as e:
         logger.error(f"Failed to initialize: {str(e)}")
         sys.exit(1)
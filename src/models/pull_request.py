@@ -1,7 +1,8 @@
 from dataclasses import dataclass
 from typing import Dict, List
+import sys
 
-@dataclass
+@dataclass(slots=True)
 class PullRequest:
     number: int
     title: str
@@ -9,4 +10,15 @@ class PullRequest:
     changes: Dict[str, List[str]]
     diffs: Dict[str, str]
     base_branch: str
-    head_branch: str
\ No newline at end of file
+    head_branch: str
+    head_sha: str = ''
+
+    def __post_init__(self):
+        # The same paths appear in changes, diffs and every risk breakdown
+        if isinstance(self.changes, dict):
+            self.changes = {
+                sys.intern(kind): [sys.intern(path) for path in paths or []]
+                for kind, paths in self.changes.items()
+            }
+        if isinstance(self.diffs, dict):
+            self.diffs = {sys.intern(path): diff for path, diff in self.diffs.items()}
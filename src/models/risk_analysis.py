@@ -0,0 +1,32 @@
+from dataclasses import dataclass, field
+from typing import List, Optional, Dict, Any
+
+ANALYSIS_ERROR = "Analysis Error"
+
+@dataclass(slots=True)
+class RiskAnalysis:
+    level: str
+    factors: List[str] = field(default_factory=list)
+    details: List[str] = field(default_factory=list)
+    score: Optional[float] = None
+    files: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    @classmethod
+    def error(cls, message: str) -> "RiskAnalysis":
+        """Analysis reported when risk could not be determined; treated as High."""
+        return cls(level="High", factors=[ANALYSIS_ERROR], details=[message])
+
+    @property
+    def failed(self) -> bool:
+        return ANALYSIS_ERROR in self.factors
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain representation used by the output writers."""
+        data: Dict[str, Any] = {"level": self.level}
+        if self.score is not None:
+            data["score"] = self.score
+        data["factors"] = list(self.factors)
+        data["details"] = list(self.details)
+        if self.files:
+            data["files"] = self.files
+        return data
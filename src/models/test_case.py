@@ -1,8 +1,9 @@
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import List, Optional, Dict, Any
 from datetime import datetime
+import sys
 
-@dataclass
+@dataclass(slots=True)
 class TestCase:
     id: str
     title: str
@@ -10,7 +11,28 @@ class TestCase:
     description: str
     steps: List[str]
     expected_result: str
-    generated_at: datetime = datetime.now()
+    generated_at: datetime = field(default_factory=datetime.now)
     approved: bool = False
     approved_by: Optional[str] = None
-    risk_factors: List[str] = None
\ No newline at end of file
+    risk_factors: List[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        # A handful of distinct priorities is shared by thousands of cases
+        self.priority = sys.intern(self.priority)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain representation used by the output writers."""
+        data = {
+            "id": self.id,
+            "title": self.title,
+            "priority": self.priority,
+            "description": self.description,
+            "steps": list(self.steps),
+            "expected_result": self.expected_result,
+            "generated_at": self.generated_at.isoformat(),
+            "approved": self.approved,
+            "approved_by": self.approved_by
+        }
+        if self.risk_factors:
+            data["risk_factors"] = list(self.risk_factors)
+        return data
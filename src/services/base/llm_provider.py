@@ -10,4 +10,8 @@ class LLMProvider(ABC):
     @abstractmethod
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about the model configuration"""
-        pass
\ No newline at end of file
+        pass
+
+    def get_last_usage(self) -> Dict[str, int]:
+        """Token usage of the most recent generate() call, if the backend reports it"""
+        return {}
\ No newline at end of file
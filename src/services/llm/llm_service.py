@@ -7,6 +7,7 @@ class LLMService(LLMProvider):
     def __init__(self, model: str, temperature: float):
         self.model = model
         self.temperature = temperature
+        self.last_usage: Dict[str, int] = {}
         self.logger = logging.getLogger(__name__)
 
     def generate(self, prompt: str, context: Dict[str, Any]) -> str:
@@ -23,6 +24,11 @@ class LLMService(LLMProvider):
         )
         
         result = response.choices[0].message.content
+        usage = getattr(response, "usage", None)
+        self.last_usage = {
+            key: int(getattr(usage, key, 0) or 0)
+            for key in ("prompt_tokens", "completion_tokens", "total_tokens")
+        } if usage else {}
         self.logger.debug(f"LLM Response:\n{result}")
         return result
 
@@ -40,7 +46,8 @@ class LLMService(LLMProvider):
                 'risk_level': str(context.get('risk_level', 'Unknown')),
                 'risk_factors': str(context.get('risk_factors', 'None')),
                 'changes': str(context.get('changes', '')),
-                'diffs': str(context.get('diffs', ''))
+                'diffs': str(context.get('diffs', '')),
+                'related_context': str(context.get('related_context', ''))
             }
             
             self.logger.debug("=== FORMATTED CONTEXT ===")
@@ -56,7 +63,7 @@ class LLMService(LLMProvider):
         except KeyError as e:
             self.logger.error(f"KeyError in prompt formatting: {e}")
             self.logger.error(f"Available context keys: {list(context.keys())}")
-            self.logger.error(f"Required keys: {['pr_title', 'pr_description', 'risk_level', 'risk_factors', 'changes', 'diffs']}")
+            self.logger.error(f"Required keys: {['pr_title', 'pr_description', 'risk_level', 'risk_factors', 'changes', 'diffs', 'related_context']}")
             raise
         except Exception as e:
             self.logger.error(f"Unexpected error in prompt formatting: {str(e)}")
@@ -79,6 +86,9 @@ class LLMService(LLMProvider):
             result.append(diff)
         return "\n".join(result)
 
+    def get_last_usage(self) -> Dict[str, int]:
+        return dict(self.last_usage)
+
     def get_model_info(self) -> Dict[str, Any]:
         return {
             "name": self.model,
@@ -1,4 +1,7 @@
 from .yaml_writer import YAMLWriter
 from .json_writer import JSONWriter
+from .markdown_writer import MarkdownWriter
+from .junit_writer import JUnitWriter
+from .multi_writer import MultiOutputWriter
 
-__all__ = ['YAMLWriter', 'JSONWriter']
\ No newline at end of file
+__all__ = ['YAMLWriter', 'JSONWriter', 'MarkdownWriter', 'JUnitWriter', 'MultiOutputWriter']
\ No newline at end of file
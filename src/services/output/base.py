@@ -8,13 +8,16 @@ class OutputProvider(ABC):
         self._write_formatted(formatted_data, file_path)
     
     def _format_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Common data formatting logic"""
+        """Common data formatting logic; models are converted to plain dicts here, once"""
         return {
             "pr_number": data["pr_number"],
             "pr_title": data["pr_title"],
-            "risk_analysis": data["risk_analysis"],
-            "test_cases": data["test_cases"]  # Already in correct format
+            "risk_analysis": self._to_plain(data["risk_analysis"]),
+            "test_cases": [self._to_plain(tc) for tc in data["test_cases"]]
         }
+
+    def _to_plain(self, value: Any) -> Any:
+        return value.to_dict() if hasattr(value, "to_dict") else value
     
     @abstractmethod
     def _write_formatted(self, formatted_data: Dict[str, Any], file_path: str) -> None:
@@ -24,4 +27,8 @@ class OutputProvider(ABC):
     @abstractmethod
     def get_format(self) -> str:
         """Get format identifier"""
-        pass
\ No newline at end of file
+        pass
+
+    def get_extension(self) -> str:
+        """File extension used when the output path is derived for this format"""
+        return f".{self.get_format()}"
\ No newline at end of file
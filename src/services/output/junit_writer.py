@@ -0,0 +1,53 @@
+import xml.etree.ElementTree as ET
+from typing import Dict, Any
+from .base import OutputProvider
+
+class JUnitWriter(OutputProvider):
+    """JUnit XML with one <testcase> per generated case.
+
+    Generated cases have not been executed yet, so every case is reported as
+    skipped; CI systems still list them next to the PR.
+    """
+
+    def _write_formatted(self, formatted_data: Dict[str, Any], file_path: str) -> None:
+        tree = ET.ElementTree(self.build(formatted_data))
+        tree.write(file_path, encoding='utf-8', xml_declaration=True)
+
+    def build(self, formatted_data: Dict[str, Any]) -> ET.Element:
+        risk = formatted_data.get("risk_analysis") or {}
+        test_cases = formatted_data.get("test_cases") or []
+        suite_name = f"PR #{formatted_data['pr_number']}: {formatted_data['pr_title']}"
+
+        suite = ET.Element("testsuite", {
+            "name": suite_name,
+            "tests": str(len(test_cases)),
+            "failures": "0",
+            "errors": "0",
+            "skipped": str(len(test_cases)),
+        })
+        properties = ET.SubElement(suite, "properties")
+        ET.SubElement(properties, "property", {"name": "risk_level", "value": str(risk.get("level", "Unknown"))})
+        if risk.get("score") is not None:
+            ET.SubElement(properties, "property", {"name": "risk_score", "value": str(risk["score"])})
+        for factor in risk.get("factors") or []:
+            ET.SubElement(properties, "property", {"name": "risk_factor", "value": str(factor)})
+
+        for tc in test_cases:
+            case = ET.SubElement(suite, "testcase", {
+                "classname": f"pr_{formatted_data['pr_number']}.{tc.get('priority', 'Medium')}",
+                "name": f"{tc.get('id', '')}: {tc.get('title', '')}",
+            })
+            ET.SubElement(case, "skipped", {"message": "Generated test case, not executed"})
+            steps = "\n".join(f"{n}. {step}" for n, step in enumerate((s for s in tc.get("steps") or [] if s), 1))
+            ET.SubElement(case, "system-out").text = (
+                f"{tc.get('description', '')}\n\nSteps:\n{steps}\n\nExpected: {tc.get('expected_result', '')}"
+            )
+
+        ET.indent(suite)
+        return suite
+
+    def get_format(self) -> str:
+        return "junit"
+
+    def get_extension(self) -> str:
+        return ".xml"
@@ -0,0 +1,52 @@
+from typing import Dict, Any, List
+from .base import OutputProvider
+
+class MarkdownWriter(OutputProvider):
+    def _write_formatted(self, formatted_data: Dict[str, Any], file_path: str) -> None:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(self.render(formatted_data))
+
+    def render(self, formatted_data: Dict[str, Any]) -> str:
+        """Render results as Markdown, suitable for a PR comment."""
+        risk = formatted_data.get("risk_analysis") or {}
+        lines = [
+            f"## QitOps: PR #{formatted_data['pr_number']} {self._escape(formatted_data['pr_title'])}",
+            "",
+            f"**Risk level:** {risk.get('level', 'Unknown')}"
+            + (f" (score {risk['score']})" if risk.get("score") is not None else ""),
+            "",
+        ]
+
+        factors = risk.get("factors") or []
+        if factors:
+            details = risk.get("details") or []
+            lines += ["| Factor | Details |", "| --- | --- |"]
+            for i, factor in enumerate(factors):
+                detail = details[i] if i < len(details) else ""
+                lines.append(f"| {self._escape(factor)} | {self._escape(detail)} |")
+            lines.append("")
+
+        test_cases: List[Dict[str, Any]] = formatted_data.get("test_cases") or []
+        lines.append(f"### Test cases ({len(test_cases)})")
+        lines.append("")
+        for tc in test_cases:
+            lines.append(f"#### {tc.get('id', '')}: {self._escape(tc.get('title', ''))}")
+            lines.append("")
+            lines.append(f"- **Priority:** {tc.get('priority', '')}")
+            lines.append(f"- **Description:** {tc.get('description', '')}")
+            steps = [s for s in tc.get("steps") or [] if s]
+            if steps:
+                lines.append("- **Steps:**")
+                lines.extend(f"  {n}. {step}" for n, step in enumerate(steps, 1))
+            lines.append(f"- **Expected result:** {tc.get('expected_result', '')}")
+            lines.append("")
+        return "\n".join(lines)
+
+    def _escape(self, text: Any) -> str:
+        return str(text).replace("|", "\\|").replace("\n", " ")
+
+    def get_format(self) -> str:
+        return "markdown"
+
+    def get_extension(self) -> str:
+        return ".md"
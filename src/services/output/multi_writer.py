@@ -0,0 +1,53 @@
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List
+from .base import OutputProvider
+
+class MultiOutputWriter(OutputProvider):
+    """Fans one result out to several writers.
+
+    The shared formatting step runs once; each writer then renders and writes
+    its own file concurrently. Each file is the output path with the writer's
+    extension, unless the path already ends with it.
+    """
+
+    def __init__(self, writers: List[OutputProvider]):
+        if not writers:
+            raise ValueError("MultiOutputWriter needs at least one writer")
+        self.writers = writers
+        self.logger = logging.getLogger(__name__)
+
+    def write(self, data: Dict[str, Any], file_path: str) -> None:
+        formatted_data = self._format_data(data)
+        self._write_formatted(formatted_data, file_path)
+
+    def _write_formatted(self, formatted_data: Dict[str, Any], file_path: str) -> None:
+        paths = self.output_paths(file_path)
+        with ThreadPoolExecutor(max_workers=len(self.writers)) as pool:
+            futures = {
+                writer.get_format(): pool.submit(writer._write_formatted, formatted_data, paths[writer.get_format()])
+                for writer in self.writers
+            }
+
+        errors = []
+        for output_format, future in futures.items():
+            try:
+                future.result()
+                self.logger.debug(f"Wrote {output_format} output to {paths[output_format]}")
+            except Exception as e:
+                self.logger.error(f"Failed to write {output_format} output: {str(e)}")
+                errors.append(f"{output_format}: {e}")
+        if errors:
+            raise IOError(f"Failed to write output: {'; '.join(errors)}")
+
+    def output_paths(self, file_path: str) -> Dict[str, str]:
+        """Map each writer's format to the file it will write."""
+        stem, extension = os.path.splitext(file_path)
+        return {
+            writer.get_format(): file_path if extension == writer.get_extension() else f"{stem}{writer.get_extension()}"
+            for writer in self.writers
+        }
+
+    def get_format(self) -> str:
+        return ",".join(writer.get_format() for writer in self.writers)
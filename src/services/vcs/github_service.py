@@ -22,7 +22,8 @@ class GitHubService(VCSProvider):
                 changes=self._get_changes(pr),
                 diffs=self._get_diffs(pr),
                 base_branch=pr.base.ref,
-                head_branch=pr.head.ref
+                head_branch=pr.head.ref,
+                head_sha=pr.head.sha
             )
         except Exception as e:
             self.logger.error(f"Error getting PR: {e}")
@@ -1,10 +1,15 @@
 import os
 import yaml
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import re
 
-def load_config(path: str) -> Dict[str, Any]:
+def load_config(path: str, sections: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Load the YAML config and replace ${VAR} references.
+
+    With ``sections``, only those top-level keys are kept and resolved, so a
+    variable the caller does not need (e.g. a VCS token) may stay unset.
+    """
     logger = logging.getLogger(__name__)
     
     if not os.path.exists(path):
@@ -16,6 +21,9 @@ def load_config(path: str) -> Dict[str, Any]:
         
     if not config:
         raise ValueError("Empty config file")
+
+    if sections is not None:
+        config = {key: value for key, value in config.items() if key in sections}
         
     # Replace environment variables
     config = _replace_env_vars(config)
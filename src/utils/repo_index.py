@@ -0,0 +1,437 @@
+import ast
+import json
+import os
+import re
+import sqlite3
+import subprocess
+import logging
+from itertools import chain
+from typing import Dict, List, Any, Iterable, Optional, Set, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    module TEXT NOT NULL,
+    is_test INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS symbols (
+    path TEXT NOT NULL,
+    name TEXT NOT NULL,
+    qualname TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    lineno INTEGER NOT NULL,
+    end_lineno INTEGER NOT NULL,
+    source TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS test_imports (
+    test_path TEXT NOT NULL,
+    module TEXT NOT NULL,
+    name TEXT
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_symbols_name ON symbols(name);
+CREATE INDEX IF NOT EXISTS idx_symbols_path ON symbols(path, lineno);
+CREATE INDEX IF NOT EXISTS idx_test_imports_module ON test_imports(module);
+CREATE INDEX IF NOT EXISTS idx_test_imports_name ON test_imports(name);
+CREATE INDEX IF NOT EXISTS idx_test_imports_path ON test_imports(test_path);
+"""
+
+_SKIP_DIRS = {'.git', '.hg', '.svn', '.tox', '.nox', '.venv', 'venv', 'node_modules',
+              '__pycache__', '.mypy_cache', '.pytest_cache', '.ruff_cache', '.qitops'}
+
+_HUNK_HEADER = re.compile(r'^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@(.*)$')
+_DEF_LINE = re.compile(r'^[+-]\s*(?:async\s+)?(?:def|class)\s+([A-Za-z_]\w*)')
+_IDENTIFIER = re.compile(r'\b[A-Za-z_]\w{2,}\b')
+
+# SQLite caps bound parameters per statement; chunk IN (...) lookups below it
+_MAX_SQL_PARAMS = 500
+
+
+class RepoIndex:
+    """Persistent symbol/test index of a local checkout, backed by SQLite.
+
+    Only Python sources are indexed. The index records the commit it reflects;
+    ``sync`` re-indexes only the files git reports as changed since then, plus
+    uncommitted ones. ``build`` re-checks every file's stat instead. Both read
+    the working tree, so the checkout should be at the PR head; see
+    ``checkout_matches``.
+    """
+
+    def __init__(self, repo_path: str, db_path: Optional[str] = None, max_source_chars: int = 1500):
+        self.repo_path = os.path.abspath(repo_path)
+        self.db_path = db_path or os.path.join(self.repo_path, '.qitops', 'index.db')
+        self.max_source_chars = max_source_chars
+        self.logger = logging.getLogger(__name__)
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def checkout_matches(self, sha: str) -> Optional[bool]:
+        """Whether the checkout's HEAD is ``sha``; None when it cannot be determined."""
+        if not sha:
+            return None
+        head = self._head()
+        return None if head is None else head == sha
+
+    def build(self) -> int:
+        """Index every Python file whose stat differs from the stored one.
+
+        Returns the number of files (re)indexed. On an existing index this only
+        touches new, changed and deleted files.
+        """
+        known = {
+            path: (mtime_ns, size)
+            for path, mtime_ns, size in self.conn.execute("SELECT path, mtime_ns, size FROM files")
+        }
+        seen: Set[str] = set()
+        indexed = 0
+
+        with self.conn:
+            for path in self._walk_python_files():
+                seen.add(path)
+                try:
+                    st = os.stat(os.path.join(self.repo_path, path))
+                except OSError:
+                    continue
+                if known.get(path) == (st.st_mtime_ns, st.st_size):
+                    continue
+                self._index_file(path, st)
+                indexed += 1
+
+            for path in known.keys() - seen:
+                self._remove_file(path)
+                indexed += 1
+
+            head = self._head()
+            if head is not None:
+                self._mark_synced(head, self._dirty_paths() or [])
+
+        self.logger.debug(f"Indexed {indexed} files in {self.repo_path}")
+        return indexed
+
+    def sync(self) -> int:
+        """Bring the index up to date with the checkout and return the number of files re-read.
+
+        Re-indexes the files changed between the commit the index was last synced
+        at and HEAD, uncommitted and untracked files, and files that were
+        uncommitted at the last sync. Falls back to ``build`` when the index has
+        no recorded commit, the checkout is not a git repository or the recorded
+        commit no longer exists.
+        """
+        indexed_sha = self._get_meta('indexed_sha')
+        head = self._head()
+        if not indexed_sha or head is None:
+            return self.build()
+
+        committed: Optional[List[str]] = []
+        if head != indexed_sha:
+            committed = self._git_paths('diff', '--name-only', '--no-renames', '--relative', '-z', indexed_sha, head)
+        dirty = self._dirty_paths()
+        if committed is None or dirty is None:
+            return self.build()
+
+        previous_dirty = json.loads(self._get_meta('dirty_paths') or '[]')
+        paths = sorted({path for path in chain(committed, dirty, previous_dirty) if self._is_indexable(path)})
+        with self.conn:
+            for path in paths:
+                self._refresh_file(path)
+            self._mark_synced(head, dirty)
+
+        self.logger.debug(f"Synced {len(paths)} files in {self.repo_path} to {head[:12]}")
+        return len(paths)
+
+    def update(self, changes: Dict[str, List[str]]) -> int:
+        """Apply a PR change set (added/modified/removed paths) to the index."""
+        updated = 0
+        with self.conn:
+            for path in chain(changes.get('removed', []), changes.get('added', []), changes.get('modified', [])):
+                if path.endswith('.py'):
+                    self._refresh_file(path)
+                    updated += 1
+        return updated
+
+    def find_relevant(self, diffs: Dict[str, str], max_definitions: int = 5,
+                      max_tests: int = 3, old_side: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+        """Return the definitions and existing tests most relevant to a PR's diffs.
+
+        Definitions of the symbols touched by the diff come first, followed by
+        indexed definitions the added lines refer to. Tests are ranked by how
+        many of the changed modules and symbols they import. Hunks are mapped
+        to symbols by their new-side line numbers, or by their old-side ones
+        with ``old_side`` when the index reflects the base of the PR.
+        """
+        changed_symbols: List[Tuple[str, str]] = []
+        changed_names: Set[str] = set()
+        referenced: Set[str] = set()
+        changed_modules: Set[str] = set()
+        changed_ranges: Dict[str, List[Tuple[int, int]]] = {}
+
+        for path, diff in diffs.items():
+            if not path.endswith('.py') or not diff:
+                continue
+            changed_modules.update(self._module_suffixes(self._module_name(path)))
+            ranges, names, idents = self._parse_diff(diff, old_side)
+            changed_ranges[path] = ranges
+            changed_names.update(names)
+            referenced.update(idents)
+            for start, end in ranges:
+                for (qualname,) in self.conn.execute(
+                    "SELECT qualname FROM symbols WHERE path = ? AND lineno <= ? AND end_lineno >= ? "
+                    "ORDER BY end_lineno - lineno",
+                    (path, end, start)
+                ):
+                    changed_symbols.append((path, qualname))
+                    changed_names.add(qualname.rsplit('.', 1)[-1])
+
+        definitions = []
+        seen_defs: Set[Tuple[str, str]] = set()
+        for path, qualname in changed_symbols:
+            if len(definitions) >= max_definitions:
+                break
+            if (path, qualname) in seen_defs:
+                continue
+            row = self.conn.execute(
+                "SELECT path, qualname, kind, lineno, source FROM symbols WHERE path = ? AND qualname = ?",
+                (path, qualname)
+            ).fetchone()
+            if row:
+                seen_defs.add((path, qualname))
+                definitions.append(self._symbol_row(row))
+
+        referenced -= changed_names
+        if referenced and len(definitions) < max_definitions:
+            for row in self._select_in(
+                "SELECT path, qualname, kind, lineno, source, end_lineno FROM symbols WHERE name IN ({}) "
+                "AND kind != 'method'",
+                sorted(referenced)
+            ):
+                if len(definitions) >= max_definitions:
+                    break
+                path, qualname, lineno, end_lineno = row[0], row[1], row[3], row[5]
+                # Code inside the changed hunks is already in the diff; the rest
+                # of a changed file (e.g. a same-module helper) is not
+                if (path, qualname) in seen_defs or any(
+                    lineno <= end and end_lineno >= start for start, end in changed_ranges.get(path, [])
+                ):
+                    continue
+                seen_defs.add((path, qualname))
+                definitions.append(self._symbol_row(row[:5]))
+
+        return {
+            "definitions": definitions,
+            "tests": self._find_tests(changed_modules, changed_names, max_tests)
+        }
+
+    def _find_tests(self, modules: Set[str], names: Set[str], limit: int) -> List[Dict[str, Any]]:
+        scores: Dict[str, int] = {}
+        for (test_path,) in self._select_in("SELECT test_path FROM test_imports WHERE module IN ({})", sorted(modules)):
+            scores[test_path] = scores.get(test_path, 0) + 1
+        for (test_path,) in self._select_in("SELECT test_path FROM test_imports WHERE name IN ({})", sorted(names)):
+            scores[test_path] = scores.get(test_path, 0) + 2
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        tests = []
+        for test_path, score in ranked:
+            test_names = [
+                name for (name,) in self.conn.execute(
+                    "SELECT qualname FROM symbols WHERE path = ? AND kind != 'class' AND name LIKE 'test%' "
+                    "ORDER BY lineno",
+                    (test_path,)
+                )
+            ]
+            tests.append({"path": test_path, "score": score, "tests": test_names})
+        return tests
+
+    def _select_in(self, query: str, values: List[str]) -> Iterable[Tuple]:
+        for i in range(0, len(values), _MAX_SQL_PARAMS):
+            chunk = values[i:i + _MAX_SQL_PARAMS]
+            yield from self.conn.execute(query.format(','.join('?' * len(chunk))), chunk)
+
+    def _symbol_row(self, row: Tuple) -> Dict[str, Any]:
+        path, qualname, kind, lineno, source = row
+        return {"path": path, "name": qualname, "kind": kind, "line": lineno, "source": source}
+
+    def _parse_diff(self, diff: str, old_side: bool = False) -> Tuple[List[Tuple[int, int]], Set[str], Set[str]]:
+        """Extract hunk line ranges, def/class names and identifiers from a patch."""
+        ranges = []
+        names: Set[str] = set()
+        idents: Set[str] = set()
+        in_hunk = False
+        for line in diff.splitlines():
+            header = _HUNK_HEADER.match(line)
+            if header:
+                in_hunk = True
+                start_group, length_group = (1, 2) if old_side else (3, 4)
+                start = int(header.group(start_group))
+                length = int(header.group(length_group)) if header.group(length_group) is not None else 1
+                ranges.append((start, start + max(length - 1, 0)))
+                continue
+            # Only a full unified diff has ---/+++ file headers, and only before the first hunk
+            if not in_hunk:
+                continue
+            definition = _DEF_LINE.match(line)
+            if definition:
+                names.add(definition.group(1))
+            # Def lines too: a one-line def or a default value can reference other code
+            if line.startswith('+'):
+                idents.update(_IDENTIFIER.findall(line))
+        return ranges, names, idents
+
+    def _git(self, *args: str) -> Optional[str]:
+        try:
+            return subprocess.run(
+                ['git', *args], cwd=self.repo_path,
+                capture_output=True, text=True, check=True, timeout=30
+            ).stdout
+        except (OSError, subprocess.SubprocessError) as e:
+            self.logger.debug(f"git {' '.join(args)} failed in {self.repo_path}: {e}")
+            return None
+
+    def _git_paths(self, *args: str) -> Optional[List[str]]:
+        """Paths from a ``-z`` git listing, relative to ``repo_path``."""
+        output = self._git(*args)
+        return None if output is None else [path for path in output.split('\0') if path]
+
+    def _head(self) -> Optional[str]:
+        head = self._git('rev-parse', 'HEAD')
+        return head.strip() if head else None
+
+    def _dirty_paths(self) -> Optional[List[str]]:
+        """Tracked files that differ from HEAD plus untracked, non-ignored files."""
+        modified = self._git_paths('diff', '--name-only', '--no-renames', '--relative', '-z', 'HEAD')
+        untracked = self._git_paths('ls-files', '--others', '--exclude-standard', '-z')
+        if modified is None or untracked is None:
+            return None
+        return sorted(set(modified + untracked))
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _mark_synced(self, head: str, dirty: List[str]) -> None:
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            [('indexed_sha', head), ('dirty_paths', json.dumps(dirty))]
+        )
+
+    def _is_indexable(self, path: str) -> bool:
+        return path.endswith('.py') and not _SKIP_DIRS.intersection(path.split('/')[:-1])
+
+    def _refresh_file(self, path: str) -> None:
+        full_path = os.path.join(self.repo_path, path)
+        if os.path.isfile(full_path):
+            self._index_file(path, os.stat(full_path))
+        else:
+            self._remove_file(path)
+
+    def _walk_python_files(self) -> Iterable[str]:
+        for root, dirs, files in os.walk(self.repo_path):
+            dirs[:] = [d for d in dirs if d not in _SKIP_DIRS]
+            for filename in files:
+                if filename.endswith('.py'):
+                    yield os.path.relpath(os.path.join(root, filename), self.repo_path).replace(os.sep, '/')
+
+    def _remove_file(self, path: str) -> None:
+        self.conn.execute("DELETE FROM files WHERE path = ?", (path,))
+        self.conn.execute("DELETE FROM symbols WHERE path = ?", (path,))
+        self.conn.execute("DELETE FROM test_imports WHERE test_path = ?", (path,))
+
+    def _index_file(self, path: str, st: os.stat_result) -> None:
+        self._remove_file(path)
+        module = self._module_name(path)
+
+        try:
+            with open(os.path.join(self.repo_path, path), 'r', encoding='utf-8') as f:
+                source = f.read()
+            tree = ast.parse(source, filename=path)
+        except (OSError, SyntaxError, UnicodeDecodeError, ValueError) as e:
+            self.logger.debug(f"Skipping symbols for {path}: {e}")
+            tree = None
+
+        symbols = list(self._collect_symbols(tree)) if tree is not None else []
+        is_test = self._is_test_file(path, symbols)
+        self.conn.execute(
+            "INSERT INTO files (path, mtime_ns, size, module, is_test) VALUES (?, ?, ?, ?, ?)",
+            (path, st.st_mtime_ns, st.st_size, module, int(is_test))
+        )
+        if tree is None:
+            return
+
+        lines = source.splitlines()
+        self.conn.executemany(
+            "INSERT INTO symbols (path, name, qualname, kind, lineno, end_lineno, source) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (path, node.name, qualname, kind, node.lineno, node.end_lineno,
+                 '\n'.join(lines[node.lineno - 1:node.end_lineno])[:self.max_source_chars])
+                for qualname, kind, node in symbols
+            ]
+        )
+
+        if is_test:
+            self.conn.executemany(
+                "INSERT INTO test_imports (test_path, module, name) VALUES (?, ?, ?)",
+                [(path, mod, name) for mod, name in self._collect_imports(tree, module)]
+            )
+
+    def _collect_symbols(self, tree: ast.AST, prefix: str = '') -> Iterable[Tuple[str, str, ast.AST]]:
+        for node in ast.iter_child_nodes(tree):
+            if isinstance(node, ast.ClassDef):
+                qualname = f"{prefix}{node.name}"
+                yield qualname, 'class', node
+                yield from self._collect_symbols(node, f"{qualname}.")
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                yield f"{prefix}{node.name}", 'method' if prefix else 'function', node
+
+    def _collect_imports(self, tree: ast.AST, module: str) -> Iterable[Tuple[str, Optional[str]]]:
+        package = module.rsplit('.', 1)[0] if '.' in module else ''
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    yield alias.name, None
+            elif isinstance(node, ast.ImportFrom):
+                base = node.module or ''
+                if node.level:
+                    parts = package.split('.') if package else []
+                    parts = parts[:len(parts) - (node.level - 1)] if node.level > 1 else parts
+                    base = '.'.join(p for p in parts + [base] if p)
+                for alias in node.names:
+                    yield base, alias.name
+                    # "from pkg import module" imports a module, not a name
+                    yield f"{base}.{alias.name}" if base else alias.name, None
+
+    def _module_name(self, path: str) -> str:
+        module = path[:-3] if path.endswith('.py') else path
+        if module.endswith('/__init__'):
+            module = module[:-len('/__init__')]
+        return module.replace('/', '.')
+
+    def _module_suffixes(self, module: str) -> List[str]:
+        """'src.utils.risk' -> ['src.utils.risk', 'utils.risk', 'risk'] to match any import root."""
+        parts = module.split('.')
+        return ['.'.join(parts[i:]) for i in range(len(parts))]
+
+    def _is_test_file(self, path: str, symbols: List[Tuple[str, str, ast.AST]]) -> bool:
+        """Test-looking path that actually defines test functions (or a conftest)."""
+        filename = os.path.basename(path)
+        if filename == 'conftest.py':
+            return True
+        test_path = (
+            filename.startswith('test_')
+            or filename.endswith('_test.py')
+            or '/tests/' in f"/{path}"
+            or '/test/' in f"/{path}"
+        )
+        return test_path and any(
+            kind != 'class' and qualname.rsplit('.', 1)[-1].startswith('test')
+            for qualname, kind, _ in symbols
+        )
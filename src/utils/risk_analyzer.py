@@ -1,7 +1,13 @@
-from typing import Dict, List, Any, Union
+from typing import Dict, List, Any, Union, Optional
 from enum import Enum
-import re
 import logging
+from models.risk_analysis import RiskAnalysis
+from utils.risk_cache import RiskCache
+from utils.risk_patterns import pattern_set_version
+from utils.risk_scoring import score_file, combine_scores, score_to_level, MIN_FACTOR_CRITICALITY
+
+# Bump when the per-file findings format or the checks in risk_scoring change
+FINDINGS_VERSION = "4"
 
 class RiskLevel(Enum):
     LOW = "Low"
@@ -9,77 +15,77 @@ class RiskLevel(Enum):
     HIGH = "High"
 
 class RiskAnalyzer:
-    def __init__(self):
+    def __init__(self, cache: Optional[RiskCache] = None):
         self.logger = logging.getLogger(__name__)
-        self.security_patterns = [
-            r'auth\w*',
-            r'password',
-            r'secret',
-            r'token',
-            r'crypt'
-        ]
-        self.breaking_patterns = [
-            r'break.*change',
-            r'deprecat\w*',
-            r'remov\w+\s+\w+',
-            r'delet\w+\s+\w+'
-        ]
+        self.cache = cache if cache is not None else RiskCache()
+        self.cache_version = f"{pattern_set_version()}:{FINDINGS_VERSION}"
+        self.cache.use_version(self.cache_version)
 
-    def analyze(self, changes: Union[Dict[str, List[str]], str], diffs: Union[Dict[str, str], str]) -> Dict[str, Any]:
+    def analyze(self, changes: Union[Dict[str, List[str]], str], diffs: Union[Dict[str, str], str]) -> RiskAnalysis:
         try:
             # Normalize inputs
             changes_dict = changes if isinstance(changes, dict) else {"modified": [str(changes)]}
             diffs_dict = diffs if isinstance(diffs, dict) else {"file": str(diffs)}
-            
-            risk_factors = []
-            details = []
-
-            # Check security risks
-            if self._check_security_risks(diffs_dict):
-                risk_factors.append("Security Risk")
-                details.append("Security-sensitive code changes detected")
 
-            # Check dependency changes
-            if self._check_dependency_changes(changes_dict):
-                risk_factors.append("Dependency Changes")
-                details.append("Package dependencies modified")
+            # Files without a patch (binary, too large) still count by path
+            files = dict(diffs_dict)
+            for paths in changes_dict.values():
+                for path in paths or []:
+                    files.setdefault(path, '')
 
-            # Check breaking changes
-            if self._check_breaking_changes(diffs_dict):
-                risk_factors.append("Breaking Changes")
-                details.append("Breaking changes detected")
+            file_findings = {name: self._analyze_file(name, content) for name, content in files.items()}
+            score = combine_scores([f["score"] for f in file_findings.values()])
+            risk_factors, details = self._collect_factors(file_findings)
 
-            level = self._determine_risk_level(risk_factors)
-            
-            return {
-                "level": level,
-                "factors": risk_factors,
-                "details": details
-            }
+            return RiskAnalysis(
+                level=self._determine_risk_level(score),
+                score=score,
+                factors=risk_factors,
+                details=details,
+                files=file_findings
+            )
         except Exception as e:
             self.logger.error(f"Error in risk analysis: {e}")
-            return {
-                "level": "High",
-                "factors": ["Analysis Error"],
-                "details": [str(e)]
-            }
+            return RiskAnalysis.error(str(e))
 
-    def _check_security_risks(self, diffs: Dict[str, str]) -> bool:
-        return any(
-            any(re.search(pattern, content, re.I) for pattern in self.security_patterns)
-            for content in diffs.values()
-        )
+    def _analyze_file(self, filename: str, content: str) -> Dict[str, Any]:
+        """Score one file's patch, reusing cached findings for identical patches."""
+        content = content or ''
+        key = RiskCache.make_key(self.cache_version, str(filename), content)
+        findings = self.cache.get(key)
+        if findings is None:
+            findings = score_file(str(filename), content)
+            self.cache.put(key, findings)
+        return findings
 
-    def _check_dependency_changes(self, changes: Dict[str, List[str]]) -> bool:
-        dependency_files = ['requirements.txt', 'package.json', 'build.gradle', 'pom.xml']
-        modified = changes.get('modified', [])
-        return any(dep in str(file) for dep in dependency_files for file in modified)
+    def _collect_factors(self, file_findings: Dict[str, Dict[str, Any]]):
+        """Turn per-file signals into the factor/detail pairs shown to users and the LLM."""
+        def files_where(predicate) -> List[str]:
+            return sorted(name for name, f in file_findings.items() if predicate(f))
+
+        def pattern_hits(kind: str):
+            return lambda f: f["criticality"] >= MIN_FACTOR_CRITICALITY and f["patterns"].get(kind, 0) > 0
+
+        checks = [
+            ("Security Risk", "Security-sensitive code changes detected",
+             files_where(pattern_hits("security"))),
+            ("Dependency Changes", "Package dependencies modified",
+             files_where(lambda f: f["signals"]["dependency_change"])),
+            ("Breaking Changes", "Breaking changes detected",
+             files_where(lambda f: pattern_hits("breaking")(f)
+                         or f["signals"]["functions_removed"] or f["signals"]["signatures_changed"])),
+            ("Error Handling Changes", "Exception handling modified",
+             files_where(lambda f: f["signals"]["exception_handling"])),
+            ("Performance Impact", "Performance-sensitive code changes detected",
+             files_where(pattern_hits("performance"))),
+        ]
 
-    def _check_breaking_changes(self, diffs: Dict[str, str]) -> bool:
-        return any(
-            any(re.search(pattern, content, re.I) for pattern in self.breaking_patterns)
-            for content in diffs.values()
-        )
+        risk_factors, details = [], []
+        for factor, detail, paths in checks:
+            if paths:
+                risk_factors.append(factor)
+                details.append(f"{detail} in {', '.join(paths[:5])}" + (" ..." if len(paths) > 5 else ""))
+        return risk_factors, details
 
-    def _determine_risk_level(self, factors: List[str]) -> str:
-        return "High" if len(factors) >= 2 else "Medium" if factors else "Low"
\ No newline at end of file
+    def _determine_risk_level(self, score: float) -> str:
+        return score_to_level(score)
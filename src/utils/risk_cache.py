@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+import sqlite3
+import logging
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class RiskCache:
+    """Bounded LRU of per-file risk findings, optionally persisted to SQLite.
+
+    Keys are derived from the file path, the patch content and the pattern-set
+    version, so entries written under an older pattern set are never hit again.
+    On disk, rows from other versions are deleted by ``use_version`` and the
+    table is capped at ``max_disk_entries``, dropping the oldest rows first.
+    """
+
+    def __init__(self, max_entries: int = 4096, path: Optional[str] = None, max_disk_entries: int = 100000):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.path = path
+        self.version = ''
+        self._disk_entries = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self.logger = logging.getLogger(__name__)
+        self.conn = None
+
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self.conn = sqlite3.connect(path)
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(risk_findings)")}
+            if columns and "version" not in columns:
+                # Cache files from before versioned rows; their entries are unreachable anyway
+                self.conn.execute("DROP TABLE risk_findings")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS risk_findings "
+                "(key TEXT PRIMARY KEY, version TEXT NOT NULL, findings TEXT NOT NULL)"
+            )
+            self.conn.commit()
+            self._disk_entries = self.conn.execute("SELECT COUNT(*) FROM risk_findings").fetchone()[0]
+
+    def use_version(self, version: str) -> None:
+        """Set the version new entries are stored under and drop rows from any other version."""
+        self.version = version
+        if self.conn is not None:
+            with self.conn:
+                removed = self.conn.execute("DELETE FROM risk_findings WHERE version != ?", (version,)).rowcount
+            if removed:
+                self._disk_entries = max(self._disk_entries - removed, 0)
+                self.logger.debug(f"Dropped {removed} risk findings from older pattern sets")
+
+    @staticmethod
+    def make_key(version: str, filename: str, patch: str) -> str:
+        digest = hashlib.sha256()
+        for part in (version, filename, patch):
+            digest.update(part.encode('utf-8', errors='surrogatepass'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+        if self.conn is not None:
+            row = self.conn.execute("SELECT findings FROM risk_findings WHERE key = ?", (key,)).fetchone()
+            if row:
+                value = json.loads(row[0])
+                self._remember(key, value)
+                self.hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, value: Any) -> None:
+        self._remember(key, value)
+        if self.conn is not None:
+            try:
+                with self.conn:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO risk_findings (key, version, findings) VALUES (?, ?, ?)",
+                        (key, self.version, json.dumps(value))
+                    )
+                    self._disk_entries += 1
+                    if self._disk_entries > self.max_disk_entries:
+                        self._evict_disk()
+            except sqlite3.Error as e:
+                self.logger.warning(f"Could not persist risk findings: {e}")
+
+    def clear(self) -> None:
+        self._entries.clear()
+        if self.conn is not None:
+            with self.conn:
+                self.conn.execute("DELETE FROM risk_findings")
+            self._disk_entries = 0
+
+    def _evict_disk(self) -> None:
+        """Trim the table to 90% of its cap so eviction runs once per batch of inserts."""
+        # The running count over-counts replaced keys; recount before deleting
+        self._disk_entries = self.conn.execute("SELECT COUNT(*) FROM risk_findings").fetchone()[0]
+        excess = self._disk_entries - int(self.max_disk_entries * 0.9)
+        if excess > 0 and self._disk_entries > self.max_disk_entries:
+            # INSERT OR REPLACE assigns a new rowid, so the lowest rowids are the oldest writes
+            self.conn.execute(
+                "DELETE FROM risk_findings WHERE rowid IN "
+                "(SELECT rowid FROM risk_findings ORDER BY rowid LIMIT ?)",
+                (excess,)
+            )
+            self._disk_entries -= excess
+
+    def close(self) -> None:
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def _remember(self, key: str, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
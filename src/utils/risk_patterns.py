@@ -1,5 +1,6 @@
 from enum import Enum
 from typing import List, Pattern
+import hashlib
 import re
 
 class RiskPatternType(Enum):
@@ -9,14 +10,72 @@ class RiskPatternType(Enum):
     COMPLEXITY = "complexity"
 
 class RiskPattern:
-    def __init__(self, pattern: str, risk_type: RiskPatternType, weight: int = 1):
+    def __init__(self, pattern: str, risk_type: RiskPatternType, weight: int = 1, code_only: bool = False):
         self.pattern = re.compile(pattern, re.IGNORECASE)
         self.type = risk_type
         self.weight = weight
+        # In Python files, code_only patterns ignore comments
+        self.code_only = code_only
 
+# Names only match as whole identifier parts: access_token and user_password
+# count, tokenizer, tokens and author do not. A bare "token" is too common
+# outside credentials (lexers, parsers) to count on its own
 RISK_PATTERNS = [
-    RiskPattern(r'auth|login|password|secret|token', RiskPatternType.SECURITY, 3),
-    RiskPattern(r'break.*change|deprecat|remove[d]?\s+\w+', RiskPatternType.BREAKING, 2),
-    RiskPattern(r'performance|optimize|slow|fast', RiskPatternType.PERFORMANCE, 2),
+    RiskPattern(
+        r'(?<![a-z0-9])(?:auth(?:n|z|enticat\w*|ori[sz]\w*)?|log_?in|passw(?:or)?ds?|passphrase|secrets?'
+        r'|credentials?|(?:access|auth|api|bearer|csrf|refresh|session)_?tokens?|jwt|api_?keys?|private_?keys?'
+        r'|(?:b|en|de)?crypt\w*)(?![a-z0-9])',
+        RiskPatternType.SECURITY, 3, code_only=True),
+    RiskPattern(r'break.*change|deprecat|remove[d]?\s+\w+|delete[d]?\s+\w+', RiskPatternType.BREAKING, 2),
+    RiskPattern(r'(?<![a-z0-9])(?:performance|optimi[sz]\w*|slow\w*|fast(?:er|est)?)(?![a-z0-9])',
+                RiskPatternType.PERFORMANCE, 2, code_only=True),
     RiskPattern(r'complex|complicated|confusing', RiskPatternType.COMPLEXITY, 1)
-]
\ No newline at end of file
+]
+
+# Matches of one pattern in a file's changed lines beyond this many add nothing
+MAX_PATTERN_HITS = 3
+
+# Manifests and lock files whose changes count as dependency changes
+DEPENDENCY_FILE_PATTERN = (
+    r'(^|/)(requirements[^/]*\.txt|package(-lock)?\.json|pom\.xml|build\.gradle|pyproject\.toml|setup\.py'
+    r'|go\.mod|Cargo\.toml)$'
+)
+
+# Multiplier applied to a file's score, first matching rule wins
+FILE_CRITICALITY = [
+    (DEPENDENCY_FILE_PATTERN, 1.5),
+    (r'(^|/)[^/]*(auth|security|crypt|permission|secret)[^/]*$', 1.5),
+    (r'(^|/)(migrations?|schema)/|\.sql$', 1.3),
+    (r'(^|/)(tests?/|test_[^/]*$|[^/]*_test\.py$)', 0.5),
+    (r'\.(md|rst|txt|adoc)$|(^|/)(docs?|LICENSE)', 0.2),
+    (r'\.(ya?ml|toml|ini|cfg|json)$', 0.8),
+]
+DEFAULT_CRITICALITY = 1.0
+
+DEPENDENCY_FILE = re.compile(DEPENDENCY_FILE_PATTERN, re.IGNORECASE)
+
+# Flat score contributions of structural signals
+SIGNAL_WEIGHTS = {
+    "dependency_change": 5.0,
+    "signature_changed": 3.0,
+    "function_removed": 4.0,
+    "exception_handling": 2.0,
+    "churn": 0.5,  # multiplied by log2(1 + changed lines)
+}
+
+# Score needed to reach each level; anything below MEDIUM is Low
+LEVEL_THRESHOLDS = {
+    "High": 12.0,
+    "Medium": 6.0,
+}
+
+def pattern_set_version() -> str:
+    """Fingerprint of every pattern and weight above; changes whenever any of them is edited."""
+    parts = [f"{p.pattern.pattern}|{p.pattern.flags}|{p.type.value}|{p.weight}|{p.code_only}" for p in RISK_PATTERNS]
+    parts.append(f"dependency|{DEPENDENCY_FILE.pattern}|{DEPENDENCY_FILE.flags}")
+    parts.append(f"max_hits|{MAX_PATTERN_HITS}")
+    parts += [f"criticality|{pattern}|{weight}" for pattern, weight in FILE_CRITICALITY]
+    parts.append(f"criticality|default|{DEFAULT_CRITICALITY}")
+    parts += [f"signal|{name}|{weight}" for name, weight in sorted(SIGNAL_WEIGHTS.items())]
+    parts += [f"level|{name}|{score}" for name, score in sorted(LEVEL_THRESHOLDS.items())]
+    return hashlib.sha256("\n".join(parts).encode('utf-8')).hexdigest()[:16]
@@ -0,0 +1,193 @@
+import ast
+import math
+import re
+import textwrap
+from itertools import islice
+from typing import Dict, List, Any, Optional, Tuple
+from utils.risk_patterns import (
+    RISK_PATTERNS, MAX_PATTERN_HITS, FILE_CRITICALITY, DEFAULT_CRITICALITY,
+    DEPENDENCY_FILE, SIGNAL_WEIGHTS, LEVEL_THRESHOLDS
+)
+
+_DEF_START = re.compile(r'^\s*(?:async\s+)?def\s+([A-Za-z_]\w*)\s*\(')
+_EXCEPTION_LINE = re.compile(r'^\s*(?:try\s*:|except\b|finally\s*:|raise\b)')
+# Whole-line comments, and trailing comments without quotes (so a '#' inside a
+# string is kept); cheap enough to run over multi-MB patches
+_PY_COMMENT = re.compile(r'^\s*#.*$|\s#[^\'"\n]*$', re.MULTILINE)
+_CRITICALITY = [(re.compile(pattern, re.IGNORECASE), weight) for pattern, weight in FILE_CRITICALITY]
+
+# IGNORECASE scanning is several times slower than a plain scan, so patterns
+# written in lowercase run case-sensitively over a lowercased copy of the text
+_PATTERNS = [
+    (risk_pattern, re.compile(risk_pattern.pattern.pattern) if risk_pattern.pattern.pattern.islower() else None)
+    for risk_pattern in RISK_PATTERNS
+]
+
+# Per-file cap on how many removed/changed functions count towards the score
+_MAX_SIGNAL_HITS = 3
+# Longest def header (in lines) we try to reassemble from a hunk
+_MAX_HEADER_LINES = 20
+
+# Files below this criticality (docs) never raise pattern-based factors
+MIN_FACTOR_CRITICALITY = 0.5
+
+
+def file_criticality(filename: str) -> float:
+    for pattern, weight in _CRITICALITY:
+        if pattern.search(filename):
+            return weight
+    return DEFAULT_CRITICALITY
+
+
+def score_file(filename: str, patch: Optional[str]) -> Dict[str, Any]:
+    """Score a single file's patch.
+
+    Only changed lines are inspected; context lines never contribute, and in
+    Python files code-only patterns skip comments. For Python files the changed
+    hunks are additionally checked for removed public functions,
+    changed public signatures and touched exception handling.
+    """
+    added, removed = _split_patch(patch or '')
+    changed_text = "\n".join(added + removed)
+    is_python = filename.endswith('.py')
+    code_text = _PY_COMMENT.sub('', changed_text) if is_python else changed_text
+    criticality = file_criticality(filename)
+
+    texts = {False: (changed_text, changed_text.lower())}
+    texts[True] = (code_text, code_text.lower()) if is_python else texts[False]
+    patterns: Dict[str, int] = {}
+    pattern_score = 0.0
+    for risk_pattern, lowercase_pattern in _PATTERNS:
+        text, lowered_text = texts[risk_pattern.code_only]
+        if lowercase_pattern is not None:
+            matches = lowercase_pattern.finditer(lowered_text)
+        else:
+            matches = risk_pattern.pattern.finditer(text)
+        hits = sum(1 for _ in islice(matches, MAX_PATTERN_HITS))
+        if hits:
+            patterns[risk_pattern.type.value] = patterns.get(risk_pattern.type.value, 0) + hits
+            pattern_score += risk_pattern.weight * hits
+
+    churn = len(added) + len(removed)
+    signal_score = SIGNAL_WEIGHTS["churn"] * math.log2(1 + churn)
+
+    signals: Dict[str, Any] = {
+        "dependency_change": bool(DEPENDENCY_FILE.search(filename)),
+        "signatures_changed": [],
+        "functions_removed": [],
+        "exception_handling": False,
+    }
+    if signals["dependency_change"]:
+        signal_score += SIGNAL_WEIGHTS["dependency_change"]
+
+    if is_python:
+        removed_defs = _collect_signatures(removed)
+        added_defs = _collect_signatures(added)
+        signals["functions_removed"] = sorted(
+            name for name in removed_defs if name not in added_defs and _is_public(name)
+        )
+        signals["signatures_changed"] = sorted(
+            name for name, header in removed_defs.items()
+            if name in added_defs and _is_public(name) and _signature_changed(header, added_defs[name])
+        )
+        signals["exception_handling"] = any(_EXCEPTION_LINE.match(line) for line in added + removed)
+
+        signal_score += SIGNAL_WEIGHTS["function_removed"] * min(len(signals["functions_removed"]), _MAX_SIGNAL_HITS)
+        signal_score += SIGNAL_WEIGHTS["signature_changed"] * min(len(signals["signatures_changed"]), _MAX_SIGNAL_HITS)
+        if signals["exception_handling"]:
+            signal_score += SIGNAL_WEIGHTS["exception_handling"]
+
+    return {
+        "score": round(criticality * (pattern_score + signal_score), 2),
+        "criticality": criticality,
+        "churn": churn,
+        "patterns": patterns,
+        "signals": signals,
+    }
+
+
+def combine_scores(file_scores: List[float]) -> float:
+    """The riskiest file dominates; every other file adds a quarter of its score."""
+    if not file_scores:
+        return 0.0
+    top = max(file_scores)
+    return round(top + 0.25 * (sum(file_scores) - top), 2)
+
+
+def score_to_level(score: float) -> str:
+    for level in ("High", "Medium"):
+        if score >= LEVEL_THRESHOLDS[level]:
+            return level
+    return "Low"
+
+
+def _split_patch(patch: str) -> Tuple[List[str], List[str]]:
+    """Split a patch into added and removed lines.
+
+    GitHub's per-file patches have no file headers, so a line starting with
+    ``---``/``+++`` is real content (e.g. an SQL comment). Only a ``---`` line
+    directly followed by a ``+++`` line before the first hunk is a header.
+    """
+    added, removed = [], []
+    lines = patch.splitlines()
+    in_hunk = False
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if line.startswith('@@'):
+            in_hunk = True
+        elif (not in_hunk and line.startswith('---')
+              and i + 1 < len(lines) and lines[i + 1].startswith('+++')):
+            i += 2
+            continue
+        elif line.startswith('+'):
+            added.append(line[1:])
+        elif line.startswith('-'):
+            removed.append(line[1:])
+        i += 1
+    return added, removed
+
+
+def _collect_signatures(lines: List[str]) -> Dict[str, str]:
+    """Map function name -> raw def header for every def in ``lines``."""
+    signatures = {}
+    i = 0
+    while i < len(lines):
+        match = _DEF_START.match(lines[i])
+        if not match:
+            i += 1
+            continue
+        header_lines = [lines[i]]
+        j = i
+        while not _header_complete(header_lines) and j + 1 < len(lines) and len(header_lines) < _MAX_HEADER_LINES:
+            j += 1
+            header_lines.append(lines[j])
+        signatures[match.group(1)] = "\n".join(header_lines)
+        i = j + 1
+    return signatures
+
+
+def _header_complete(header_lines: List[str]) -> bool:
+    header = "\n".join(header_lines)
+    return header.count('(') <= header.count(')') and header.rstrip().endswith(':')
+
+
+def _signature_changed(old_header: str, new_header: str) -> bool:
+    if " ".join(old_header.split()) == " ".join(new_header.split()):
+        return False
+    # Only headers whose text differs pay for an AST parse
+    return _normalize_signature(old_header) != _normalize_signature(new_header)
+
+
+def _normalize_signature(header: str) -> str:
+    """Compare signatures by AST so formatting-only edits are not reported."""
+    try:
+        tree = ast.parse(textwrap.dedent(header) + "\n    pass")
+        node = tree.body[0]
+        return ast.dump(node.args) + ast.dump(node.returns) if node.returns else ast.dump(node.args)
+    except (SyntaxError, IndexError, AttributeError, ValueError):
+        return " ".join(header.split())
+
+
+def _is_public(name: str) -> bool:
+    return not name.startswith('_') or (name.startswith('__') and name.endswith('__'))
@@ -0,0 +1,157 @@
+import json
+import os
+import sqlite3
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional, Union
+
+DEFAULT_HISTORY_PATH = ".qitops/history.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    pr_number INTEGER NOT NULL,
+    head_sha TEXT NOT NULL,
+    pr_title TEXT,
+    risk_level TEXT,
+    risk_score REAL,
+    risk_analysis TEXT,
+    test_cases TEXT,
+    test_case_count INTEGER NOT NULL DEFAULT 0,
+    timings TEXT,
+    model TEXT,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
+    total_tokens INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_runs_repo_pr ON runs(repo, pr_number, created_at);
+CREATE INDEX IF NOT EXISTS idx_runs_sha ON runs(head_sha);
+CREATE INDEX IF NOT EXISTS idx_runs_risk ON runs(risk_level, created_at);
+CREATE INDEX IF NOT EXISTS idx_runs_created ON runs(created_at);
+"""
+
+_SUMMARY_COLUMNS = (
+    "id, created_at, repo, pr_number, head_sha, pr_title, risk_level, risk_score, "
+    "test_case_count, model, total_tokens"
+)
+
+
+def parse_since(value: Union[str, datetime]) -> str:
+    """Normalize an ISO date or timestamp to the UTC form ``created_at`` is stored in.
+
+    Naive values are taken as UTC. Raises ValueError for anything else.
+    """
+    moment = value if isinstance(value, datetime) else datetime.fromisoformat(value.strip())
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).isoformat(timespec='seconds')
+
+
+class RunHistory:
+    """Embedded SQLite store of every generation run.
+
+    The database runs in WAL mode with a busy timeout so several batch workers
+    can record runs against the same file concurrently.
+    """
+
+    def __init__(self, path: str = DEFAULT_HISTORY_PATH, timeout: float = 30.0):
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=timeout)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def record_run(self,
+                   repo: str,
+                   pr_number: int,
+                   head_sha: str,
+                   pr_title: str,
+                   risk_analysis: Dict[str, Any],
+                   test_cases: List[Dict[str, Any]],
+                   timings: Optional[Dict[str, float]] = None,
+                   model: Optional[str] = None,
+                   usage: Optional[Dict[str, int]] = None) -> int:
+        """Store one run and return its id."""
+        usage = usage or {}
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (created_at, repo, pr_number, head_sha, pr_title, risk_level, risk_score, "
+                "risk_analysis, test_cases, test_case_count, timings, model, "
+                "prompt_tokens, completion_tokens, total_tokens) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                    repo,
+                    pr_number,
+                    head_sha or '',
+                    pr_title,
+                    risk_analysis.get("level"),
+                    risk_analysis.get("score"),
+                    json.dumps(risk_analysis),
+                    json.dumps(test_cases),
+                    len(test_cases),
+                    json.dumps(timings or {}),
+                    model,
+                    usage.get("prompt_tokens"),
+                    usage.get("completion_tokens"),
+                    usage.get("total_tokens"),
+                )
+            )
+        return cursor.lastrowid
+
+    def has_run(self, repo: str, pr_number: int, head_sha: str) -> bool:
+        """True when this exact PR head has already been processed."""
+        if not head_sha:
+            return False
+        row = self.conn.execute(
+            "SELECT 1 FROM runs WHERE head_sha = ? AND repo = ? AND pr_number = ? LIMIT 1",
+            (head_sha, repo, pr_number)
+        ).fetchone()
+        return row is not None
+
+    def query(self,
+              repo: Optional[str] = None,
+              pr_number: Optional[int] = None,
+              head_sha: Optional[str] = None,
+              risk_level: Optional[str] = None,
+              since: Optional[Union[str, datetime]] = None,
+              limit: int = 50) -> List[Dict[str, Any]]:
+        """Summaries of matching runs, newest first.
+
+        ``since`` is an ISO date or timestamp (see ``parse_since``); invalid values raise ValueError.
+        """
+        clauses, params = [], []
+        for column, value in (("repo", repo), ("pr_number", pr_number),
+                              ("head_sha", head_sha), ("risk_level", risk_level)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since:
+            clauses.append("created_at >= ?")
+            params.append(parse_since(since))
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.conn.execute(
+            f"SELECT {_SUMMARY_COLUMNS} FROM runs {where} ORDER BY created_at DESC, id DESC LIMIT ?",
+            (*params, limit)
+        )
+        return [dict(row) for row in rows]
+
+    def get_run(self, run_id: int) -> Optional[Dict[str, Any]]:
+        """Full record of one run, with JSON columns decoded."""
+        row = self.conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+        if row is None:
+            return None
+        run = dict(row)
+        for column in ("risk_analysis", "test_cases", "timings"):
+            run[column] = json.loads(run[column]) if run[column] else None
+        return run